@@ -2,11 +2,13 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from src.enums import *
 from src.utils import *
-from statistics import mean
+from src.contract_kernels import as_kernel_paths, asian_payoff, barrier_payoff_fused, is_breached_1d
 import numpy as np
 
 
 class Contract(ABC):
+    __slots__ = ('underlying', 'derivative_type', 'long_short', 'direction', 'strike', 'expiry', 'num_mon',
+                 'contract_type', 'is_call', '_intrinsic_value', '__weakref__')
     timeline_digits: int = 6
 
     def __init__(self, underlying: Stock, derivative_type: PutCallFwd, long_short: LongShort, strike: float,
@@ -19,6 +21,13 @@ class Contract(ABC):
         self.expiry: float = expiry
         self.num_mon: int = round(max(num_mon, 1))  # Asian: nr of averaging points; Barrier: nr of monitoring points
         self.contract_type: str = type(self).get_contract_type()
+        # Payoff branch is selected once here instead of on every payoff evaluation. The plain function is stored,
+        # not a bound method, which would make every contract a reference cycle; call it as
+        # self._intrinsic_value(self, spot).
+        self.is_call: bool = self.derivative_type == PutCallFwd.CALL
+        if self.derivative_type not in self._intrinsic_value_funcs:
+            self.raise_incorrect_derivative_type_error(tuple(self._intrinsic_value_funcs))
+        self._intrinsic_value = self._intrinsic_value_funcs[self.derivative_type]
 
     @classmethod
     def get_contract_type(cls):
@@ -47,6 +56,23 @@ class Contract(ABC):
     def payoff(self, spot: dict[float, float]) -> float:
         pass
 
+    def _call_intrinsic_value(self, spot: float) -> float:
+        diff = spot - self.strike
+        return diff if diff > 0.0 else 0.0
+
+    def _put_intrinsic_value(self, spot: float) -> float:
+        diff = self.strike - spot
+        return diff if diff > 0.0 else 0.0
+
+    def _forward_intrinsic_value(self, spot: float) -> float:
+        return spot - self.strike
+
+    _intrinsic_value_funcs = {
+        PutCallFwd.CALL: _call_intrinsic_value,
+        PutCallFwd.PUT: _put_intrinsic_value,
+        PutCallFwd.FWD: _forward_intrinsic_value,
+    }
+
     def raise_incorrect_derivative_type_error(
             self,
             supported: tuple[PutCallFwd, ...] = (PutCallFwd.CALL, PutCallFwd.PUT)) -> None:
@@ -57,8 +83,14 @@ class Contract(ABC):
         raise ValueError(f'{type(self).__name__} expects spot price on timeline {self.get_timeline()}, '
                          f'but received on {received}')
 
+    def raise_paths_shape_error(self, received: tuple[int, ...]):
+        raise ValueError(f'{type(self).__name__} expects paths of shape (number of paths, {self.num_mon}), '
+                         f'but received {received}')
+
 
 class ForwardContract(Contract):
+    __slots__ = ()
+
     def __init__(self, underlying: Stock, long_short: LongShort, strike: float, expiry: float) -> None:
         super().__init__(underlying, PutCallFwd.FWD, long_short, strike, expiry)
 
@@ -69,10 +101,20 @@ class ForwardContract(Contract):
         t = self.get_timeline()[0]
         if t not in spot.keys():
             self.raise_missing_spot_error(list(spot.keys()))
-        return self.direction * (spot[t] - self.strike)
+        return self.direction * self._intrinsic_value(self, spot[t])
+
+    def payoff_vec(self, spots: np.ndarray) -> np.ndarray:
+        """
+        Vectorized payoff over a batch of spot scenarios at expiry.
+        :param spots: Array of spot prices at expiry.
+        :return: Array of payoffs.
+        """
+        return self.direction * (np.asarray(spots, dtype=np.float64) - self.strike)
 
 
 class EuropeanContract(Contract):
+    __slots__ = ()
+
     def __init__(self, underlying: Stock, derivative_type: PutCallFwd, long_short: LongShort, strike: float,
                  expiry: float) -> None:
         if derivative_type not in [PutCallFwd.CALL, PutCallFwd.PUT]:
@@ -86,15 +128,24 @@ class EuropeanContract(Contract):
         t = self.get_timeline()[0]
         if t not in spot.keys():
             self.raise_missing_spot_error(list(spot.keys()))
-        if self.derivative_type == PutCallFwd.CALL:
-            return self.direction * max(spot[t] - self.strike, 0)
-        elif self.derivative_type == PutCallFwd.PUT:
-            return self.direction * max(self.strike - spot[t], 0)
+        return self.direction * self._intrinsic_value(self, spot[t])
+
+    def payoff_vec(self, spots: np.ndarray) -> np.ndarray:
+        """
+        Vectorized payoff over a batch of spot scenarios at expiry.
+        :param spots: Array of spot prices at expiry.
+        :return: Array of payoffs.
+        """
+        spots = np.asarray(spots, dtype=np.float64)
+        if self.is_call:
+            return self.direction * np.maximum(spots - self.strike, 0.0)
         else:
-            self.raise_incorrect_derivative_type_error()
+            return self.direction * np.maximum(self.strike - spots, 0.0)
 
 
 class AmericanContract(Contract):
+    __slots__ = ()
+
     def __init__(self, underlying: Stock, derivative_type: PutCallFwd, long_short: LongShort, strike: float,
                  expiry: float) -> None:
         if derivative_type not in [PutCallFwd.CALL, PutCallFwd.PUT]:
@@ -108,42 +159,72 @@ class AmericanContract(Contract):
         t = self.get_timeline()[0]
         if t not in spot.keys():
             self.raise_missing_spot_error(list(spot.keys()))
-        if self.derivative_type == PutCallFwd.CALL:
-            return self.direction * max(spot[t] - self.strike, 0)
-        elif self.derivative_type == PutCallFwd.PUT:
-            return self.direction * max(self.strike - spot[t], 0)
+        return self.direction * self._intrinsic_value(self, spot[t])
+
+    def payoff_vec(self, spots: np.ndarray) -> np.ndarray:
+        """
+        Vectorized payoff over a batch of spot scenarios at expiry.
+        :param spots: Array of spot prices at expiry.
+        :return: Array of payoffs.
+        """
+        spots = np.asarray(spots, dtype=np.float64)
+        if self.is_call:
+            return self.direction * np.maximum(spots - self.strike, 0.0)
         else:
-            self.raise_incorrect_derivative_type_error()
+            return self.direction * np.maximum(self.strike - spots, 0.0)
 
 
-class AsianContract(Contract):
+class PathDependentContract(Contract):
+    __slots__ = ('_timeline',)
+
     def __init__(self, underlying: Stock, derivative_type: PutCallFwd, long_short: LongShort, strike: float,
                  expiry: float, num_mon: int) -> None:
+        """
+        Base of call and put contracts observed on num_mon equidistant fixings until expiry.
+        The timeline is computed once here.
+        """
         if derivative_type not in [PutCallFwd.CALL, PutCallFwd.PUT]:
             self.raise_incorrect_derivative_type_error()
         super().__init__(underlying, derivative_type, long_short, strike, expiry, num_mon)
+        fixing_times = np.arange(1, self.num_mon + 1) / self.num_mon * self.expiry
+        self._timeline: tuple[float, ...] = tuple(round(t, self.timeline_digits) for t in fixing_times.tolist())
 
     def get_timeline(self) -> list[float]:
-        return [round(((i+1) / self.num_mon) * self.expiry, self.timeline_digits) for i in range(self.num_mon)]
+        return list(self._timeline)
+
+    def check_paths(self, paths: np.ndarray) -> np.ndarray:
+        paths = as_kernel_paths(paths)
+        if paths.ndim != 2 or paths.shape[1] != self.num_mon:
+            self.raise_paths_shape_error(paths.shape)
+        return paths
+
+
+class AsianContract(PathDependentContract):
+    __slots__ = ()
 
     def payoff(self, spot: dict[float, float]) -> float:
         timeline = self.get_timeline()
         if not set(timeline).issubset(set(spot.keys())):
             self.raise_missing_spot_error(list(spot.keys()))
-        obs = [spot[t] for t in timeline]
-        if self.derivative_type == PutCallFwd.CALL:
-            return self.direction * max(mean(obs) - self.strike, 0)
-        elif self.derivative_type == PutCallFwd.PUT:
-            return self.direction * max(self.strike - mean(obs), 0)
-        else:
-            self.raise_incorrect_derivative_type_error()
+        obs = np.array([spot[t] for t in timeline])
+        return self.direction * self._intrinsic_value(self, obs.sum() / obs.size)
+
+    def payoff_paths(self, paths: np.ndarray) -> np.ndarray:
+        """
+        Vectorized payoff over a batch of simulated paths.
+        :param paths: 2D array of spot prices with shape (number of paths, number of points on timeline).
+            float32 paths are evaluated without upcasting.
+        :return: Array of path payoffs.
+        """
+        paths = self.check_paths(paths)
+        return asian_payoff(paths, float(self.strike), self.direction, self.is_call)
 
 
-class EuropeanBarrierContract(Contract):
+class EuropeanBarrierContract(PathDependentContract):
+    __slots__ = ('barrier',)
+
     def __init__(self, underlying: Stock, derivative_type: PutCallFwd, long_short: LongShort, strike: float,
                  expiry: float, num_mon: int, barrier: float, up_down: UpDown, in_out: InOut) -> None:
-        if derivative_type not in [PutCallFwd.CALL, PutCallFwd.PUT]:
-            self.raise_incorrect_derivative_type_error()
         super().__init__(underlying, derivative_type, long_short, strike, expiry, num_mon)
         self.barrier: Barrier = Barrier(barrier, up_down, in_out)
 
@@ -156,46 +237,47 @@ class EuropeanBarrierContract(Contract):
         }
         return out
 
-    def get_timeline(self) -> list[float]:
-        return [round(((i+1) / self.num_mon) * self.expiry, self.timeline_digits) for i in range(self.num_mon)]
-
     def payoff(self, spot: dict[float, float], vol: float = np.nan) -> float:
         timeline = self.get_timeline()
         if not set(timeline).issubset(set(spot.keys())):
             self.raise_missing_spot_error(list(spot.keys()))
-        obs = [spot[t] for t in timeline]
-        in_out = self.barrier.in_out
         is_breached = self.barrier.is_breached(spot, vol)
-
-        mult = float(int(in_out == InOut.IN) * is_breached + int(in_out == InOut.OUT) * (1 - is_breached))
-        if self.derivative_type == PutCallFwd.CALL:
-            return self.direction * mult * max(obs[-1] - self.strike, 0)
-        elif self.derivative_type == PutCallFwd.PUT:
-            return self.direction * mult * max(self.strike - obs[-1], 0)
-        else:
-            self.raise_incorrect_derivative_type_error()
+        mult = is_breached if self.barrier.is_in else 1.0 - is_breached
+        return self.direction * mult * self._intrinsic_value(self, spot[timeline[-1]])
+
+    def payoff_paths(self, paths: np.ndarray, initial_spot: float = np.nan) -> np.ndarray:
+        """
+        Vectorized payoff over a batch of simulated paths. The barrier is monitored on the contractual timeline
+        and, if given, on the initial spot, like payoff with a fixing at time 0.
+        :param paths: 2D array of spot prices with shape (number of paths, number of points on timeline).
+            float32 paths are evaluated without upcasting.
+        :param initial_spot: Spot at time 0 shared by all paths. NaN if it is not monitored.
+        :return: Array of path payoffs.
+        """
+        paths = self.check_paths(paths)
+        return barrier_payoff_fused(paths, float(initial_spot), float(self.strike), float(self.barrier.barrier_level),
+                                    self.direction, self.is_call, self.barrier.is_in, self.barrier.is_up)
 
 
 class Barrier:
+    __slots__ = ('barrier_level', 'up_down', 'is_up', 'in_out', 'is_in', '__weakref__')
+
     def __init__(self, barrier_level: float, up_down: UpDown, in_out: InOut) -> None:
         self.barrier_level: float = barrier_level
         if up_down not in [UpDown.UP, UpDown.DOWN]:
             self.raise_incorrect_up_down_type()
         self.up_down: UpDown = up_down
-        if in_out not in [InOut.IN, in_out.OUT]:
+        self.is_up: bool = up_down == UpDown.UP
+        if in_out not in [InOut.IN, InOut.OUT]:
             self.raise_incorrect_in_out_type()
         self.in_out: InOut = in_out
+        self.is_in: bool = in_out == InOut.IN
 
     def is_breached(self, spot: dict[float, float], vol: float) -> float:
         timeline = list(spot.keys())
-        observations = [spot[t] for t in timeline]
+        observations = np.fromiter(spot.values(), dtype=np.float64, count=len(timeline))
         if np.isnan(vol):      # standard case without probabilities
-            if self.up_down == UpDown.UP:
-                return float(any([self.barrier_level <= price for price in observations]))
-            elif self.up_down == UpDown.DOWN:
-                return float(any([self.barrier_level >= price for price in observations]))
-            else:
-                self.raise_incorrect_up_down_type()
+            return 1.0 if is_breached_1d(observations, float(self.barrier_level), self.is_up) else 0.0
         else:
             probs_no_breach = []
             for i in range(len(timeline)-1):
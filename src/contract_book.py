@@ -0,0 +1,107 @@
+from __future__ import annotations
+from src.contract import *
+from src.model import MarketModel
+import numpy as np
+
+
+class ContractBook:
+    supported_contracts: tuple[type[Contract], ...] = (ForwardContract, EuropeanContract, AmericanContract)
+    # The discounted expected terminal payoff is only the fair value without early exercise
+    fair_value_contracts: tuple[type[Contract], ...] = (ForwardContract, EuropeanContract)
+
+    def __init__(self, contracts: list[Contract], dtype: np.dtype = np.float64) -> None:
+        """
+        Structure-of-arrays view of a book of vanilla contracts on a single underlying.
+        :param contracts: Forward, European or American contracts.
+        :param dtype: Floating point type of payoff evaluation. np.float32 halves the memory traffic of
+            scenario payoffs; averages over scenarios are always accumulated in float64.
+        """
+        if len(contracts) == 0:
+            raise ValueError(f'{type(self).__name__} requires at least one contract')
+        for contract in contracts:
+            if not isinstance(contract, self.supported_contracts):
+                raise TypeError(f'Contract must be one of '
+                                f'{", ".join(cls.__name__ for cls in self.supported_contracts)} '
+                                f'but received {type(contract).__name__}')
+        underlyings = {contract.underlying for contract in contracts}
+        if len(underlyings) != 1:
+            raise ValueError(f'Contracts of {type(self).__name__} must share the underlying, '
+                             f'but received {", ".join(underlyings)}')
+        self.underlying: Stock = contracts[0].underlying
+        self.dtype: np.dtype = np.dtype(dtype)
+        self.strikes: np.ndarray = np.array([c.strike for c in contracts], dtype=self.dtype)
+        self.expiries: np.ndarray = np.array([c.expiry for c in contracts], dtype=self.dtype)
+        self.directions: np.ndarray = np.array([c.direction for c in contracts], dtype=np.int8)
+        self.contract_types: np.ndarray = np.array([self.get_contract_type_code(c) for c in contracts], dtype=np.int8)
+        self.is_call: np.ndarray = np.array([c.derivative_type == PutCallFwd.CALL for c in contracts])
+        self.is_fwd: np.ndarray = np.array([c.derivative_type == PutCallFwd.FWD for c in contracts])
+        self.is_fair_value_supported: np.ndarray = np.array([isinstance(c, self.fair_value_contracts)
+                                                             for c in contracts])
+        # +1 for call and forward, -1 for put: intrinsic value is max(sign * (spot - strike), 0)
+        self.intrinsic_sign: np.ndarray = np.where(self.is_call | self.is_fwd, 1.0, -1.0).astype(self.dtype)
+
+    def __len__(self) -> int:
+        return self.strikes.shape[0]
+
+    @classmethod
+    def get_contract_type_code(cls, contract: Contract) -> int:
+        """
+        Index of the supported contract class matching the contract, subclasses included.
+        """
+        return next(i for i, base in enumerate(cls.supported_contracts) if isinstance(contract, base))
+
+    def has_single_expiry(self) -> bool:
+        return bool(np.all(self.expiries == self.expiries[0]))
+
+    def payoff_all(self, spots: np.ndarray) -> np.ndarray:
+        """
+        Payoff of every contract of the book in every spot scenario.
+        :param spots: Spot prices at expiry. 2D array with shape (number of scenarios, number of contracts) holding
+            the terminal spots of each contract at its own expiry. A 1D array of scenarios shared by all contracts is
+            only accepted if every contract of the book has the same expiry.
+        :return: 2D array of payoffs with shape (number of scenarios, number of contracts), in the dtype of the book.
+        """
+        spots = self.check_spots(np.asarray(spots, dtype=self.dtype))
+        if spots.ndim == 1:
+            spots = spots[:, None]
+        diff = self.intrinsic_sign * (spots - self.strikes)
+        return self.directions * np.where(self.is_fwd, diff, np.maximum(diff, 0.0))
+
+    def calc_expected_payoffs(self, spots: np.ndarray) -> np.ndarray:
+        """
+        Scenario average of the payoff of every contract of the book.
+        :param spots: Spot prices at expiry, see payoff_all.
+        :return: 1D float64 array of average payoffs, one per contract.
+        """
+        return self.payoff_all(spots).mean(axis=0, dtype=np.float64)
+
+    def calc_fair_values(self, spots: np.ndarray, model: MarketModel) -> np.ndarray:
+        """
+        Expected payoff of every contract of the book discounted from its own expiry. Only supported for books
+        of Forward and European contracts, as the early exercise premium of American contracts is not captured.
+        :param spots: Spot prices at expiry, see payoff_all.
+        :param model: Market model providing the risk-free rate.
+        :return: 1D float64 array of fair values, one per contract.
+        """
+        self.check_fair_value_supported()
+        return self.calc_expected_payoffs(spots) * model.calc_df_vec(self.expiries)
+
+    def check_fair_value_supported(self) -> None:
+        if not self.is_fair_value_supported.all():
+            raise TypeError(f'Fair value of {type(self).__name__} is only supported for '
+                            f'{", ".join(cls.__name__ for cls in self.fair_value_contracts)}')
+
+    def check_spots(self, spots):
+        if spots.ndim not in (1, 2) or (spots.ndim == 2 and spots.shape[1] != len(self)):
+            self.raise_spots_shape_error(spots.shape)
+        if spots.ndim == 1 and not self.has_single_expiry():
+            self.raise_shared_spots_error()
+        return spots
+
+    def raise_spots_shape_error(self, received: tuple[int, ...]):
+        raise ValueError(f'{type(self).__name__} expects spots of shape (number of scenarios,) or '
+                         f'(number of scenarios, {len(self)}) but received {received}')
+
+    def raise_shared_spots_error(self):
+        raise ValueError(f'{type(self).__name__} has contracts with different expiries '
+                         f'{sorted(set(self.expiries.tolist()))}, spots must be given per contract as a 2D array')
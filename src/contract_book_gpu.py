@@ -0,0 +1,77 @@
+from __future__ import annotations
+from contextlib import nullcontext
+from src.contract_book import *
+import numpy as np
+
+try:
+    import cupy
+except ImportError:
+    cupy = None
+
+
+def has_cuda_device() -> bool:
+    if cupy is None:
+        return False
+    try:
+        return cupy.cuda.runtime.getDeviceCount() > 0
+    except cupy.cuda.runtime.CUDARuntimeError:
+        return False
+
+
+is_gpu_available: bool = has_cuda_device()
+xp = cupy if is_gpu_available else np
+
+
+class GPUContractBook(ContractBook):
+    def __init__(self, contracts: list[Contract], dtype: np.dtype = np.float64) -> None:
+        """
+        ContractBook evaluated with CuPy on the GPU. Falls back to NumPy on the CPU if CuPy is not installed
+        or no CUDA device is found.
+        :param contracts: Forward, European or American contracts.
+        :param dtype: Floating point type of payoff evaluation, see ContractBook.
+        """
+        super().__init__(contracts, dtype)
+        self.device_strikes = xp.asarray(self.strikes)
+        self.device_directions = xp.asarray(self.directions)
+        self.device_is_fwd = xp.asarray(self.is_fwd)
+        self.device_intrinsic_sign = xp.asarray(self.intrinsic_sign)
+
+    @staticmethod
+    def to_host(array) -> np.ndarray:
+        return xp.asnumpy(array) if is_gpu_available else array
+
+    def device_payoff_all(self, spots: np.ndarray, stream=None):
+        """
+        Same as payoff_all, but the result stays on the device.
+        :param spots: Spot prices at expiry, see ContractBook.payoff_all.
+        :param stream: Optional CuPy stream used for the host to device transfer and the computation.
+        :return: Device array of payoffs with shape (number of scenarios, number of contracts).
+        """
+        with stream if stream is not None else nullcontext():
+            spots = self.check_spots(xp.asarray(spots, dtype=self.dtype))
+            if spots.ndim == 1:
+                spots = spots[:, None]
+            diff = self.device_intrinsic_sign * (spots - self.device_strikes)
+            return self.device_directions * xp.where(self.device_is_fwd, diff, xp.maximum(diff, 0.0))
+
+    def payoff_all(self, spots: np.ndarray, stream=None) -> np.ndarray:
+        return self.to_host(self.device_payoff_all(spots, stream))
+
+    def device_expected_payoffs(self, spots: np.ndarray, stream=None):
+        # reduce over scenarios on the device, only one value per contract is copied back
+        with stream if stream is not None else nullcontext():
+            return self.device_payoff_all(spots, stream).mean(axis=0, dtype=xp.float64)
+
+    def calc_expected_payoffs(self, spots: np.ndarray, stream=None) -> np.ndarray:
+        return self.to_host(self.device_expected_payoffs(spots, stream))
+
+    def calc_fair_values(self, spots: np.ndarray, model: MarketModel, stream=None) -> np.ndarray:
+        """
+        Same as ContractBook.calc_fair_values, discounting is applied on the device before the copy back.
+        Discount factors come from the model, only one value per contract is copied to the device.
+        """
+        self.check_fair_value_supported()
+        with stream if stream is not None else nullcontext():
+            expected_payoffs = self.device_expected_payoffs(spots, stream)
+            fair_values = expected_payoffs * xp.asarray(model.calc_df_vec(self.expiries))
+        return self.to_host(fair_values)
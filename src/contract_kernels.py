@@ -0,0 +1,105 @@
+import numpy as np
+from numba import njit, prange
+
+
+def as_kernel_paths(paths: np.ndarray) -> np.ndarray:
+    """
+    Converts paths to the C-contiguous layout expected by the kernels. float32 paths are kept in single
+    precision, any other dtype is converted to float64.
+    """
+    paths = np.asarray(paths)
+    return np.ascontiguousarray(paths, dtype=np.float32 if paths.dtype == np.float32 else np.float64)
+
+
+# Explicit signatures compile the kernels eagerly at import (or load them from cache) instead of on the first call.
+# Paths must be C-contiguous float64 or float32 arrays; sums and payoffs are always computed in float64.
+@njit(['float64[::1](float64[:, ::1], float64, float64, boolean)',
+       'float64[::1](float32[:, ::1], float64, float64, boolean)'], parallel=True, fastmath=True, cache=True)
+def asian_payoff(paths: np.ndarray, strike: float, direction: float, is_call: bool) -> np.ndarray:
+    """
+    Payoff of arithmetic average Asian option on each simulated path.
+    :param paths: 2D array of observations with shape (number of paths, number of averaging points).
+    :param strike: Strike of the contract.
+    :param direction: 1.0 for long, -1.0 for short position.
+    :param is_call: True for call, False for put.
+    :return: Array of path payoffs.
+    """
+    num_of_paths, num_of_obs = paths.shape
+    out = np.empty(num_of_paths)
+    for i in prange(num_of_paths):
+        s = 0.0
+        for t in range(num_of_obs):
+            s += paths[i, t]
+        avg = s / num_of_obs
+        diff = avg - strike if is_call else strike - avg
+        out[i] = direction * max(diff, 0.0)
+    return out
+
+
+@njit(['boolean(float64[::1], float64, boolean)', 'boolean(float32[::1], float64, boolean)'], cache=True)
+def is_breached_1d(path: np.ndarray, barrier: float, is_up: bool) -> bool:
+    """
+    Checks whether a single path breaches the barrier. Returns at the first crossing.
+    :param path: 1D array of observations.
+    :param barrier: Barrier level.
+    :param is_up: True for up, False for down barrier.
+    :return: True if the barrier is breached.
+    """
+    if is_up:
+        for t in range(path.shape[0]):
+            if path[t] >= barrier:
+                return True
+    else:
+        for t in range(path.shape[0]):
+            if path[t] <= barrier:
+                return True
+    return False
+
+
+@njit(['boolean[::1](float64[:, ::1], float64, boolean)', 'boolean[::1](float32[:, ::1], float64, boolean)'],
+      parallel=True, cache=True)
+def is_breached_paths(paths: np.ndarray, barrier: float, is_up: bool) -> np.ndarray:
+    num_of_paths = paths.shape[0]
+    out = np.empty(num_of_paths, dtype=np.bool_)
+    for i in prange(num_of_paths):
+        out[i] = is_breached_1d(paths[i], barrier, is_up)
+    return out
+
+
+@njit(['float64[::1](float64[:, ::1], float64, float64, float64, float64, boolean, boolean, boolean)',
+       'float64[::1](float32[:, ::1], float64, float64, float64, float64, boolean, boolean, boolean)'],
+      parallel=True, cache=True)
+def barrier_payoff_fused(paths: np.ndarray, initial_spot: float, strike: float, barrier: float, direction: float,
+                         is_call: bool, is_in: bool, is_up: bool) -> np.ndarray:
+    """
+    Payoff of discretely monitored European barrier option on each simulated path.
+    Breach detection and the terminal payoff are computed in a single scan of each path, which stops
+    at the first crossing. Compiled without fastmath, as that would fold the NaN comparisons of initial_spot.
+    :param paths: 2D array of observations with shape (number of paths, number of monitoring points).
+        The last column is the fixing at expiry.
+    :param initial_spot: Spot at time 0, monitored before the path columns. NaN if it is not monitored.
+    :param strike: Strike of the contract.
+    :param barrier: Barrier level.
+    :param direction: 1.0 for long, -1.0 for short position.
+    :param is_call: True for call, False for put.
+    :param is_in: True for knock-in, False for knock-out.
+    :param is_up: True for up, False for down barrier.
+    :return: Array of path payoffs.
+    """
+    num_of_paths, num_of_obs = paths.shape
+    out = np.empty(num_of_paths)
+    breached_at_start = initial_spot >= barrier if is_up else initial_spot <= barrier
+    for i in prange(num_of_paths):
+        breached = breached_at_start
+        for t in range(0 if breached else num_of_obs):
+            price = paths[i, t]
+            if price >= barrier if is_up else price <= barrier:
+                breached = True
+                break
+        if breached != is_in:
+            out[i] = 0.0
+        else:
+            last = paths[i, num_of_obs - 1]
+            diff = last - strike if is_call else strike - last
+            out[i] = direction * max(diff, 0.0)
+    return out
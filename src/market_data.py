@@ -74,6 +74,8 @@ class VolGrid:
         self.underlying: Stock = underlying
         self.points: np.ndarray = points
         self.values: np.ndarray = values
+        # Incremented on every bump, so that models sharing the volgrid can invalidate their cached vols.
+        self.version: int = 0
         if not (self.values.ndim == 1 and self.points.ndim == 2 and self.points.shape[1] == 2
                 and self.points.shape[0] == self.values.shape[0]):
             raise AssertionError('Incorrect dimensions for volatility grid points and values')
@@ -87,6 +89,10 @@ class VolGrid:
         """
         return self.interpolator(strike_expiry_pairs)
 
+    def bump(self, bump_size: float) -> None:
+        self.values += bump_size
+        self.version += 1
+
 
 class LinearInterpolatorNearestExtrapolator:
     def __init__(self, points: np.ndarray, values: np.ndarray) -> None:
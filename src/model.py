@@ -2,15 +2,22 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from src.market_data import *
 from src.enums import *
+import math
 import numpy as np
 
 
 class MarketModel(ABC):
+    vol_cache_size: int = 4096
+    vol_cache_digits: int = 8
+
     def __init__(self, underlying: Stock) -> None:
         self.underlying: Stock = underlying
         self.risk_free_rate: float = MarketData.get_risk_free_rate()
         self.spot: float = MarketData.get_spot()[self.underlying]
         self.volgrid: VolGrid = MarketData.get_volgrid()[self.underlying]
+        self._vol_cache: dict[tuple[float, float], float] = dict()
+        self._vol_cache_volgrid: VolGrid = self.volgrid
+        self._vol_cache_version: int = self.volgrid.version
 
     def bump_rate(self, bump_size: float) -> None:
         self.risk_free_rate += bump_size
@@ -19,15 +26,50 @@ class MarketModel(ABC):
         self.spot += bump_size
 
     def bump_volgrid(self, bump_size: float) -> None:
-        self.volgrid.values += bump_size
+        self.volgrid.bump(bump_size)
 
     def calc_df(self, tenor: float) -> float:
-        return np.exp(-1.0 * self.risk_free_rate * tenor)
+        return math.exp(-1.0 * self.risk_free_rate * tenor)
+
+    def calc_df_vec(self, tenors: np.ndarray) -> np.ndarray:
+        return np.exp(-1.0 * self.risk_free_rate * np.asarray(tenors, dtype=np.float64))
 
     @abstractmethod
     def get_vol(self, strike: float, expiry: float) -> float:
         pass
 
+    @abstractmethod
+    def get_vol_batch(self, strikes: np.ndarray, expiries: np.ndarray) -> np.ndarray:
+        pass
+
+    def is_vol_cache_valid(self) -> bool:
+        return self._vol_cache_volgrid is self.volgrid and self._vol_cache_version == self.volgrid.version
+
+    def reset_vol_cache(self) -> None:
+        self._vol_cache.clear()
+        self._vol_cache_volgrid = self.volgrid
+        self._vol_cache_version = self.volgrid.version
+
+    def _lookup_vol(self, strike: float, expiry: float) -> float:
+        """
+        Memoized volgrid lookup. Coordinates are rounded to vol_cache_digits to form the cache key.
+        The volgrid is shared by all models of the underlying, so the cache is cleared whenever the volgrid
+        is replaced or bumped through any of them.
+        """
+        if not self.is_vol_cache_valid():
+            self.reset_vol_cache()
+        key = (round(strike, self.vol_cache_digits), round(expiry, self.vol_cache_digits))
+        vol = self._vol_cache.get(key)
+        if vol is None:
+            if len(self._vol_cache) >= self.vol_cache_size:
+                self._vol_cache.clear()
+            vol = self.calc_vol_uncached(*key)
+            self._vol_cache[key] = vol
+        return vol
+
+    def calc_vol_uncached(self, strike: float, expiry: float) -> float:
+        return self.volgrid.get_vol(np.array([(strike, expiry)]))[0]
+
     @staticmethod
     def get_models() -> dict[str, MarketModel]:
         return {cls.__name__: cls for cls in MarketModel.__subclasses__()}
@@ -50,13 +92,69 @@ class BSVolModel(MarketModel):
         """
         atm_strike = 1.0 * self.reference_spot
         expiry = 1.0
-        coordinate = np.array([(atm_strike, expiry)])
-        return self.volgrid.get_vol(coordinate)[0]
+        return self._lookup_vol(atm_strike, expiry)
+
+    def get_vol_batch(self, strikes: np.ndarray, expiries: np.ndarray) -> np.ndarray:
+        """
+        Vectorized version of get_vol. The volatility surface is flat, so the ATM vol is broadcast.
+        :param strikes: Array of strikes. Ignored apart from its shape.
+        :param expiries: Array of expiries. Ignored apart from its shape.
+        :return: Array of implied volatilities.
+        """
+        shape = np.broadcast_shapes(np.shape(strikes), np.shape(expiries))
+        return np.full(shape, self.get_vol(np.nan, np.nan))
 
 
 class FlatVolModel(MarketModel):
-    def __init__(self, underlying: Stock):
+    def __init__(self, underlying: Stock, vol_table_steps: int = 0):
+        """
+        :param underlying: Underlying stock.
+        :param vol_table_steps: If positive, the volgrid is tabulated once on a (strike, expiry) lattice of this many
+            steps per axis, extended with the volgrid nodes, and vols inside the volgrid range are interpolated
+            bilinearly in the table. This is exact on the volgrid nodes and approximate in between.
+            Zero (default) disables the table. get_vol memoizes table values like volgrid values, and the table
+            is rebuilt together with the vol cache when the volgrid changes.
+        """
         super().__init__(underlying)
+        self.vol_table_steps: int = vol_table_steps
+        self.strike_grid: np.ndarray = np.empty(0)
+        self.expiry_grid: np.ndarray = np.empty(0)
+        self.vol_table: np.ndarray | None = None
+        self.build_vol_table()
+
+    def build_vol_table(self) -> None:
+        if self.vol_table_steps <= 0:
+            self.vol_table = None
+            return
+        strikes, expiries = self.volgrid.points.T
+        self.strike_grid = np.union1d(np.linspace(strikes.min(), strikes.max(), self.vol_table_steps), strikes)
+        self.expiry_grid = np.union1d(np.linspace(expiries.min(), expiries.max(), self.vol_table_steps), expiries)
+        if len(self.strike_grid) < 2 or len(self.expiry_grid) < 2:
+            raise ValueError(f'Volatility table of {type(self).__name__} requires at least two distinct strikes '
+                             f'and expiries in the volgrid')
+        strike_mesh, expiry_mesh = np.meshgrid(self.strike_grid, self.expiry_grid, indexing='ij')
+        coordinates = np.column_stack([strike_mesh.ravel(), expiry_mesh.ravel()])
+        self.vol_table = self.volgrid.get_vol(coordinates).reshape(strike_mesh.shape)
+
+    def reset_vol_cache(self) -> None:
+        super().reset_vol_cache()
+        self.build_vol_table()
+
+    def is_in_vol_table(self, strikes: np.ndarray, expiries: np.ndarray) -> np.ndarray:
+        return ((self.strike_grid[0] <= strikes) & (strikes <= self.strike_grid[-1])
+                & (self.expiry_grid[0] <= expiries) & (expiries <= self.expiry_grid[-1]))
+
+    def interpolate_vol_table(self, strikes: np.ndarray, expiries: np.ndarray) -> np.ndarray:
+        """
+        Bilinear interpolation in the volatility table. Coordinates must lie inside the table.
+        """
+        i = np.clip(np.searchsorted(self.strike_grid, strikes, side='right') - 1, 0, len(self.strike_grid) - 2)
+        j = np.clip(np.searchsorted(self.expiry_grid, expiries, side='right') - 1, 0, len(self.expiry_grid) - 2)
+        w_strike = (strikes - self.strike_grid[i]) / (self.strike_grid[i + 1] - self.strike_grid[i])
+        w_expiry = (expiries - self.expiry_grid[j]) / (self.expiry_grid[j + 1] - self.expiry_grid[j])
+        table = self.vol_table
+        return ((1 - w_strike) * (1 - w_expiry) * table[i, j] + w_strike * (1 - w_expiry) * table[i + 1, j]
+                + (1 - w_strike) * w_expiry * table[i, j + 1] + w_strike * w_expiry * table[i + 1, j + 1])
 
     def get_vol(self, strike: float, expiry: float) -> float:
         """
@@ -65,5 +163,33 @@ class FlatVolModel(MarketModel):
         :param expiry: Expiry of option contract.
         :return: Implied volatility.
         """
-        coordinate = np.array([(strike, expiry)])
-        return self.volgrid.get_vol(coordinate)[0]
+        return self._lookup_vol(strike, expiry)
+
+    def calc_vol_uncached(self, strike: float, expiry: float) -> float:
+        if self.vol_table is not None and self.is_in_vol_table(strike, expiry):
+            return float(self.interpolate_vol_table(strike, expiry))
+        return super().calc_vol_uncached(strike, expiry)
+
+    def get_vol_batch(self, strikes: np.ndarray, expiries: np.ndarray) -> np.ndarray:
+        """
+        Vectorized version of get_vol, interpolating all (strike, expiry) pairs with a single volgrid call.
+        :param strikes: Array of strikes.
+        :param expiries: Array of expiries, broadcast against strikes.
+        :return: Array of implied volatilities.
+        """
+        if not self.is_vol_cache_valid():
+            self.reset_vol_cache()
+        strikes, expiries = np.broadcast_arrays(np.asarray(strikes, dtype=np.float64),
+                                                np.asarray(expiries, dtype=np.float64))
+        shape = strikes.shape
+        strikes = strikes.ravel()
+        expiries = expiries.ravel()
+        vols = np.empty(strikes.shape)
+        if self.vol_table is None:
+            mask = np.zeros(strikes.shape, dtype=bool)
+        else:
+            mask = self.is_in_vol_table(strikes, expiries)
+            vols[mask] = self.interpolate_vol_table(strikes[mask], expiries[mask])
+        if not mask.all():
+            vols[~mask] = self.volgrid.get_vol(np.column_stack([strikes[~mask], expiries[~mask]]))
+        return vols.reshape(shape)
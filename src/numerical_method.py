@@ -139,7 +139,7 @@ class BlackScholesPDE(NumericalMethod):
         self.setup_boundary_conditions()
 
     def setup_boundary_conditions(self) -> None:
-        df = self.model.calc_df(self.contract.expiry - self.time_disc)
+        df = self.model.calc_df_vec(self.contract.expiry - self.time_disc)
         if self.contract.derivative_type == PutCallFwd.CALL:
             # terminal condition
             self.grid[:, -1] = np.maximum(self.stock_disc - self.contract.strike, 0)
@@ -355,19 +355,19 @@ class TreePricer(Pricer, ABC):
         self.tree_method.init_tree()
         spot_tree = self.tree_method.spot_tree
         continuation_value_tree = [[np.nan for _ in level] for level in spot_tree]
-        for i in range(len(spot_tree[-1])):
-            log_spot = spot_tree[-1][i]
-            spot = {self.contract.get_timeline()[0]: np.exp(log_spot)}
-            discounted_continuation_value = self.tree_method.df[-1] * self.contract.payoff(spot)
-            continuation_value_tree[-1][i] = discounted_continuation_value
+        final_spots = np.exp(np.array(spot_tree[-1]))
+        continuation_value_tree[-1] = list(self.tree_method.df[-1] * self.contract.payoff_vec(final_spots))
+        # loop invariants are read once, outside the node loop
+        expiry = self.contract.get_timeline()[0]
+        prob_up, prob_down = self.tree_method.prob
+        pre_final_value = self.pre_final_value
         for step in range(self.params.nr_steps - 1, -1, -1):
-            for i in range(len(spot_tree[step])):
-                log_spot = spot_tree[step][i]
-                spot = {self.contract.get_timeline()[0]: np.exp(log_spot)}
-                discounted_continuation_value = self.tree_method.prob[1] * continuation_value_tree[step + 1][i] + \
-                                                self.tree_method.prob[0] * continuation_value_tree[step + 1][i + 1]
-                continuation_value_tree[step][i] = (
-                    self.pre_final_value(spot, step, discounted_continuation_value))
+            level = continuation_value_tree[step]
+            next_level = continuation_value_tree[step + 1]
+            for i, log_spot in enumerate(spot_tree[step]):
+                spot = {expiry: math.exp(log_spot)}
+                discounted_continuation_value = prob_down * next_level[i] + prob_up * next_level[i + 1]
+                level[i] = pre_final_value(spot, step, discounted_continuation_value)
         return continuation_value_tree[0][0]
 
 
@@ -389,7 +389,7 @@ class AmericanTreePricer(TreePricer):
 
     def pre_final_value(self, spot: dict[float, float], step: int, discounted_continuation_value: float) -> float:
         intrinsic_value = self.tree_method.df[step] * self.contract.payoff(spot)
-        return max(discounted_continuation_value, intrinsic_value) if self.contract.long_short == LongShort.LONG \
+        return max(discounted_continuation_value, intrinsic_value) if self.contract.direction > 0 \
             else min(discounted_continuation_value, intrinsic_value)
 
 
@@ -467,17 +467,25 @@ class GenericMCPricer(Pricer):
         contractual_timeline = contract.get_timeline()
         spot_paths = self.mc_method.simulate_spot_paths()
         num_of_paths = self.params.num_of_paths
-        path_payoff = np.empty(num_of_paths)
-        for path in range(num_of_paths):
-            fixing_schedule = dict(zip([0] + contractual_timeline,
-                                        np.concatenate((np.array([self.model.spot]), spot_paths[path, :])) ))
-            path_payoff[path] = contract.payoff(fixing_schedule)
+        if isinstance(contract, AsianContract):
+            path_payoff = contract.payoff_paths(spot_paths)
+        elif isinstance(contract, EuropeanBarrierContract):
+            # the barrier is also monitored at t=0, as in the fixing dicts below
+            path_payoff = contract.payoff_paths(spot_paths, self.model.spot)
+        else:
+            path_payoff = np.empty(num_of_paths)
+            fixing_times = [0] + contractual_timeline
+            fixings = np.column_stack((np.full(num_of_paths, self.model.spot), spot_paths)).tolist()
+            payoff = contract.payoff
+            for path in range(num_of_paths):
+                path_payoff[path] = payoff(dict(zip(fixing_times, fixings[path])))
         maturity = contract.expiry
         if self.params.control_variate:
             # adjust path_payoff inplace
             self.apply_control_var_adj(path_payoff, spot_paths)
-        fv = mean(path_payoff) * self.model.calc_df(maturity)
-        fv_conf_interval = tuple([(mean(path_payoff) + 1.96 * mult * np.std(path_payoff, ddof=1) /
+        mean_payoff = np.mean(path_payoff)
+        fv = mean_payoff * self.model.calc_df(maturity)
+        fv_conf_interval = tuple([(mean_payoff + 1.96 * mult * np.std(path_payoff, ddof=1) /
                                    np.sqrt(self.params.num_of_paths)) * self.model.calc_df(maturity)
                                   for mult in [-1, 1]])
         return fv, fv_conf_interval
@@ -490,14 +498,15 @@ class GenericMCPricer(Pricer):
         contract_cv = pricer_cv.contract
         num_of_path = len(path_payoff)
         path_payoff_cv = np.empty(num_of_path)
+        fixing_times = contract_cv.get_timeline()
+        fixings = spot_paths.tolist()
+        payoff_cv = contract_cv.payoff
         for path in range(num_of_path):
-            fixing_schedule = dict(zip(contract_cv.get_timeline(), spot_paths[path, :]))
-            path_payoff_cv[path] = contract_cv.payoff(fixing_schedule)
+            path_payoff_cv[path] = payoff_cv(dict(zip(fixing_times, fixings[path])))
         cov = np.cov(path_payoff, path_payoff_cv)
         b = cov[0][1]/cov[1][1]
         contract_cv_mean = pricer_cv.calc_fair_value() / self.model.calc_df(contract_cv.expiry)
-        for i in range(num_of_path):
-            path_payoff[i] = path_payoff[i] - b * (path_payoff_cv[i] - contract_cv_mean)
+        path_payoff -= b * (path_payoff_cv - contract_cv_mean)
 
     def get_controlvar_helper_pricer(self, contract: Contract) -> Pricer:
         if isinstance(contract, EuropeanContract):
@@ -602,13 +611,15 @@ class BarrierBrownianBridgePricer(Pricer):
             num_of_paths = self.params.num_of_paths
             vol = self.model.get_vol(contract.strike, contract.expiry)
             path_payoff = np.empty(num_of_paths)
+            fixing_times = [0] + contractual_timeline
+            fixings = np.column_stack((np.full(num_of_paths, self.model.spot), spot_paths)).tolist()
+            payoff = contract.payoff
             for path in range(num_of_paths):
-                fixing_schedule = dict(zip([0] + contractual_timeline,
-                                           np.concatenate((np.array([self.model.spot]), spot_paths[path, :])) ))
-                path_payoff[path] = contract.payoff(fixing_schedule, vol)
+                path_payoff[path] = payoff(dict(zip(fixing_times, fixings[path])), vol)
             maturity = contract.expiry
-            fv = mean(path_payoff) * self.model.calc_df(maturity)
-            fv_contint = [(mean(path_payoff) + 1.96 * mult * np.std(path_payoff, ddof=1) / np.sqrt(self.params.num_of_paths))
+            mean_payoff = np.mean(path_payoff)
+            fv = mean_payoff * self.model.calc_df(maturity)
+            fv_contint = [(mean_payoff + 1.96 * mult * np.std(path_payoff, ddof=1) / np.sqrt(self.params.num_of_paths))
                           * self.model.calc_df(maturity) for mult in [-1, 1]]
             return fv, fv_contint
 
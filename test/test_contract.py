@@ -1,6 +1,11 @@
+import copy
+import gc
+import pickle
+import weakref
 import pytest
 import numpy as np
 from src.contract import *
+from src.contract_kernels import barrier_payoff_fused, is_breached_paths
 from src.enums import *
 from src.market_data import *
 
@@ -30,6 +35,44 @@ class TestContractProperties:
             contract = globals()[class_name](*params)
             assert contract_property in contract.to_dict().keys()
 
+    def test_contract_copy(self):
+        contracts = [
+            EuropeanContract(self.underlying, self.derivative_type, self.long_short, self.strike, self.expiry),
+            AsianContract(self.underlying, self.derivative_type, self.long_short, self.strike, self.expiry, 12),
+            EuropeanBarrierContract(self.underlying, self.derivative_type, self.long_short, self.strike,
+                                    self.expiry, 12, 1.05 * self.ref_spot, UpDown.UP, InOut.OUT),
+        ]
+        for contract in contracts:
+            assert not hasattr(contract, '__dict__')
+            fixings = dict(zip(contract.get_timeline(), np.linspace(0.9, 1.1, contract.num_mon) * self.ref_spot))
+            for copied in (pickle.loads(pickle.dumps(contract)), copy.deepcopy(contract)):
+                assert copied.to_dict() == contract.to_dict()
+                assert copied.payoff(fixings) == contract.payoff(fixings)
+
+    def test_path_dependent_timeline(self):
+        asian = AsianContract(self.underlying, self.derivative_type, self.long_short, self.strike, self.expiry, 12)
+        barrier = EuropeanBarrierContract(self.underlying, self.derivative_type, self.long_short, self.strike,
+                                          self.expiry, 12, 1.05 * self.ref_spot, UpDown.UP, InOut.OUT)
+        assert isinstance(asian, PathDependentContract) and isinstance(barrier, PathDependentContract)
+        assert asian.get_timeline() == barrier.get_timeline()
+        assert asian.get_timeline()[-1] == self.expiry and len(asian.get_timeline()) == 12
+
+    def test_contract_freed_without_gc(self):
+        contract = EuropeanContract(self.underlying, self.derivative_type, self.long_short, self.strike, self.expiry)
+        ref = weakref.ref(contract)
+        gc.disable()
+        try:
+            del contract
+            assert ref() is None
+        finally:
+            gc.enable()
+
+    def test_contract_weakref(self):
+        contract = EuropeanBarrierContract(self.underlying, self.derivative_type, self.long_short, self.strike,
+                                           self.expiry, 12, 1.05 * self.ref_spot, UpDown.UP, InOut.OUT)
+        assert weakref.ref(contract)() is contract
+        assert weakref.ref(contract.barrier)() is contract.barrier
+
 
 @pytest.mark.parametrize('spot', np.arange(0.5, 2, 0.5))
 @pytest.mark.parametrize('strike', np.arange(0.5, 2, 0.5))
@@ -59,3 +102,93 @@ class TestPayoff:
         contract = EuropeanContract(self.underlying, PutCallFwd.PUT, self.long_short, strike, self.expiry)
         obs = {round(self.expiry, contract.timeline_digits): spot}
         assert contract.payoff(obs) == pytest.approx(max(strike - spot, 0))
+
+    def test_payoff_vec(self, spot, strike):
+        spot = spot * self.ref_spot
+        strike = strike * self.ref_spot
+        spots = np.array([0.5 * spot, spot, 1.5 * spot])
+        contracts = [ForwardContract(self.underlying, self.long_short, strike, self.expiry),
+                     EuropeanContract(self.underlying, PutCallFwd.CALL, self.long_short, strike, self.expiry),
+                     EuropeanContract(self.underlying, PutCallFwd.PUT, self.long_short, strike, self.expiry),
+                     AmericanContract(self.underlying, PutCallFwd.CALL, LongShort.SHORT, strike, self.expiry)]
+        for contract in contracts:
+            t = round(self.expiry, contract.timeline_digits)
+            expected = [contract.payoff({t: s}) for s in spots]
+            assert contract.payoff_vec(spots) == pytest.approx(expected)
+
+
+class TestPathPayoff:
+    underlying = Stock.TEST_COMPANY
+    ref_spot = MarketData.get_spot()[underlying]
+    expiry = 1.0
+    num_mon = 4
+    paths = ref_spot * np.array([[1.00, 1.05, 1.10, 1.02],
+                                 [0.95, 0.90, 0.85, 0.92],
+                                 [1.02, 1.20, 1.00, 0.98],
+                                 [0.99, 0.97, 1.01, 1.04]])
+
+    def path_payoffs(self, contract):
+        return [contract.payoff(dict(zip(contract.get_timeline(), path))) for path in self.paths]
+
+    @pytest.mark.parametrize('derivative_type', [PutCallFwd.CALL, PutCallFwd.PUT])
+    @pytest.mark.parametrize('long_short', [LongShort.LONG, LongShort.SHORT])
+    def test_asian_payoff_paths(self, derivative_type, long_short):
+        contract = AsianContract(self.underlying, derivative_type, long_short, self.ref_spot, self.expiry,
+                                 self.num_mon)
+        assert contract.payoff_paths(self.paths) == pytest.approx(self.path_payoffs(contract))
+
+    @pytest.mark.parametrize('derivative_type', [PutCallFwd.CALL, PutCallFwd.PUT])
+    @pytest.mark.parametrize('up_down, barrier', [(UpDown.UP, 1.1), (UpDown.DOWN, 0.9)])
+    @pytest.mark.parametrize('in_out', [InOut.IN, InOut.OUT])
+    def test_barrier_payoff_paths(self, derivative_type, up_down, barrier, in_out):
+        contract = EuropeanBarrierContract(self.underlying, derivative_type, LongShort.LONG, self.ref_spot,
+                                           self.expiry, self.num_mon, barrier * self.ref_spot, up_down, in_out)
+        assert contract.payoff_paths(self.paths) == pytest.approx(self.path_payoffs(contract))
+
+    @pytest.mark.parametrize('derivative_type', [PutCallFwd.CALL, PutCallFwd.PUT])
+    @pytest.mark.parametrize('up_down, barrier', [(UpDown.UP, 1.1), (UpDown.DOWN, 0.9)])
+    @pytest.mark.parametrize('vol', [np.nan, 0.2])
+    def test_barrier_in_out_parity(self, derivative_type, up_down, barrier, vol):
+        contracts = {in_out: EuropeanBarrierContract(self.underlying, derivative_type, LongShort.LONG, self.ref_spot,
+                                                     self.expiry, self.num_mon, barrier * self.ref_spot, up_down,
+                                                     in_out)
+                     for in_out in InOut}
+        vanilla = EuropeanContract(self.underlying, derivative_type, LongShort.LONG, self.ref_spot, self.expiry)
+        for path in self.paths:
+            fixings = dict(zip(contracts[InOut.IN].get_timeline(), path))
+            in_out_sum = contracts[InOut.IN].payoff(fixings, vol) + contracts[InOut.OUT].payoff(fixings, vol)
+            assert in_out_sum == pytest.approx(vanilla.payoff({round(self.expiry, vanilla.timeline_digits): path[-1]}))
+
+    @pytest.mark.parametrize('up_down, barrier', [(UpDown.UP, 1.1), (UpDown.DOWN, 0.9)])
+    def test_is_breached_paths(self, up_down, barrier):
+        barrier_obj = Barrier(barrier * self.ref_spot, up_down, InOut.IN)
+        expected = [bool(barrier_obj.is_breached(dict(enumerate(path)), np.nan)) for path in self.paths]
+        breached = is_breached_paths(np.ascontiguousarray(self.paths), barrier_obj.barrier_level, barrier_obj.is_up)
+        assert list(breached) == expected
+
+    def test_payoff_paths_shape(self):
+        contract = AsianContract(self.underlying, PutCallFwd.CALL, LongShort.LONG, self.ref_spot, self.expiry,
+                                 self.num_mon)
+        with pytest.raises(ValueError, match='paths of shape'):
+            contract.payoff_paths(self.paths[:, 1:])
+
+    def test_float32_payoff_paths(self):
+        contracts = [AsianContract(self.underlying, PutCallFwd.CALL, LongShort.LONG, self.ref_spot, self.expiry,
+                                   self.num_mon),
+                     EuropeanBarrierContract(self.underlying, PutCallFwd.PUT, LongShort.LONG, self.ref_spot,
+                                             self.expiry, self.num_mon, 0.9 * self.ref_spot, UpDown.DOWN, InOut.IN)]
+        for contract in contracts:
+            expected = contract.payoff_paths(self.paths)
+            assert contract.payoff_paths(self.paths.astype(np.float32)) == pytest.approx(expected, rel=1e-6)
+
+    @pytest.mark.parametrize('up_down, barrier', [(UpDown.UP, 0.99), (UpDown.DOWN, 1.01), (UpDown.DOWN, 0.9)])
+    @pytest.mark.parametrize('in_out', [InOut.IN, InOut.OUT])
+    def test_barrier_payoff_fused_initial_spot(self, up_down, barrier, in_out):
+        contract = EuropeanBarrierContract(self.underlying, PutCallFwd.CALL, LongShort.LONG, 0.9 * self.ref_spot,
+                                           self.expiry, self.num_mon, barrier * self.ref_spot, up_down, in_out)
+        expected = [contract.payoff({0: self.ref_spot} | dict(zip(contract.get_timeline(), path)))
+                    for path in self.paths]
+        payoffs = barrier_payoff_fused(np.ascontiguousarray(self.paths), self.ref_spot, contract.strike,
+                                       contract.barrier.barrier_level, contract.direction, contract.is_call,
+                                       contract.barrier.is_in, contract.barrier.is_up)
+        assert payoffs == pytest.approx(expected)
@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+from src.contract_book import *
+from src.contract_book_gpu import GPUContractBook, is_gpu_available
+from src.model import FlatVolModel
+from src.market_data import *
+
+MarketData.initialize()
+
+
+class TestContractBook:
+    underlying = Stock.TEST_COMPANY
+    ref_spot = MarketData.get_spot()[underlying]
+    contracts = [
+        ForwardContract(underlying, LongShort.LONG, 0.9 * ref_spot, 1.0),
+        EuropeanContract(underlying, PutCallFwd.CALL, LongShort.LONG, ref_spot, 1.0),
+        EuropeanContract(underlying, PutCallFwd.PUT, LongShort.SHORT, 1.1 * ref_spot, 2.0),
+        AmericanContract(underlying, PutCallFwd.PUT, LongShort.LONG, 0.8 * ref_spot, 0.5),
+        ForwardContract(underlying, LongShort.SHORT, 1.2 * ref_spot, 1.5),
+    ]
+    spots = np.outer(ref_spot * np.arange(0.5, 1.6, 0.1), np.linspace(0.9, 1.1, len(contracts)))
+
+    def test_payoff_all(self):
+        book = ContractBook(self.contracts)
+        expected = np.column_stack([contract.payoff_vec(self.spots[:, i]) for i, contract in enumerate(self.contracts)])
+        assert len(book) == len(self.contracts)
+        assert book.payoff_all(self.spots) == pytest.approx(expected)
+
+    def test_payoff_all_shared_spots(self):
+        contracts = [ForwardContract(self.underlying, LongShort.LONG, 0.9 * self.ref_spot, 1.0),
+                     EuropeanContract(self.underlying, PutCallFwd.PUT, LongShort.SHORT, 1.1 * self.ref_spot, 1.0),
+                     AmericanContract(self.underlying, PutCallFwd.CALL, LongShort.LONG, self.ref_spot, 1.0)]
+        spots = self.spots[:, 0]
+        expected = np.column_stack([contract.payoff_vec(spots) for contract in contracts])
+        assert ContractBook(contracts).payoff_all(spots) == pytest.approx(expected)
+
+    @pytest.mark.parametrize('book_type', [ContractBook, GPUContractBook])
+    def test_shared_spots_with_different_expiries(self, book_type):
+        with pytest.raises(ValueError):
+            book_type(self.contracts).payoff_all(self.spots[:, 0])
+
+    def test_spots_shape(self):
+        with pytest.raises(ValueError):
+            ContractBook(self.contracts).payoff_all(self.spots[:, :2])
+
+    def test_contract_subclass(self):
+        class SubEuropeanContract(EuropeanContract):
+            __slots__ = ()
+
+        contract = SubEuropeanContract(self.underlying, PutCallFwd.CALL, LongShort.LONG, self.ref_spot, 1.0)
+        book = ContractBook(self.contracts + [contract])
+        assert book.contract_types[-1] == ContractBook.get_contract_type_code(self.contracts[1])
+
+    def test_unsupported_contract(self):
+        asian = AsianContract(self.underlying, PutCallFwd.CALL, LongShort.LONG, self.ref_spot, 1.0, 12)
+        with pytest.raises(TypeError):
+            ContractBook(self.contracts + [asian])
+
+    def test_mixed_underlyings(self):
+        other = EuropeanContract(Stock.BLUECHIP_BANK, PutCallFwd.CALL, LongShort.LONG, self.ref_spot, 1.0)
+        with pytest.raises(ValueError):
+            ContractBook(self.contracts + [other])
+
+    @pytest.mark.parametrize('book_type', [ContractBook, GPUContractBook])
+    def test_calc_expected_payoffs(self, book_type):
+        book = book_type(self.contracts)
+        expected = [contract.payoff_vec(self.spots[:, i]).mean() for i, contract in enumerate(self.contracts)]
+        assert book.calc_expected_payoffs(self.spots) == pytest.approx(expected)
+
+    @pytest.mark.parametrize('book_type', [ContractBook, GPUContractBook])
+    def test_calc_fair_values(self, book_type):
+        model = FlatVolModel(self.underlying)
+        european = [i for i, contract in enumerate(self.contracts) if not isinstance(contract, AmericanContract)]
+        contracts = [self.contracts[i] for i in european]
+        spots = self.spots[:, european]
+        expected = [contract.payoff_vec(spots[:, i]).mean() * model.calc_df(contract.expiry)
+                    for i, contract in enumerate(contracts)]
+        assert book_type(contracts).calc_fair_values(spots, model) == pytest.approx(expected)
+
+    @pytest.mark.parametrize('book_type', [ContractBook, GPUContractBook])
+    def test_calc_fair_values_american(self, book_type):
+        with pytest.raises(TypeError):
+            book_type(self.contracts).calc_fair_values(self.spots, FlatVolModel(self.underlying))
+
+    def test_gpu_payoff_all(self):
+        book = GPUContractBook(self.contracts)
+        assert book.payoff_all(self.spots) == pytest.approx(ContractBook(self.contracts).payoff_all(self.spots))
+
+    @pytest.mark.skipif(not is_gpu_available, reason='CuPy or CUDA device is not available')
+    def test_gpu_device_arrays(self):
+        import cupy
+        book = GPUContractBook(self.contracts, np.float32)
+        stream = cupy.cuda.Stream()
+        payoffs = book.device_payoff_all(self.spots, stream)
+        stream.synchronize()
+        assert isinstance(payoffs, cupy.ndarray) and payoffs.dtype == np.float32
+        assert isinstance(book.device_expected_payoffs(self.spots), cupy.ndarray)
+        fair_values = GPUContractBook(self.contracts[:3]).calc_fair_values(self.spots[:, :3],
+                                                                           FlatVolModel(self.underlying))
+        assert isinstance(fair_values, np.ndarray)
+
+    @pytest.mark.parametrize('book_type', [ContractBook, GPUContractBook])
+    def test_float32_book(self, book_type):
+        book = book_type(self.contracts, np.float32)
+        payoffs = book.payoff_all(self.spots)
+        expected_payoffs = book.calc_expected_payoffs(self.spots)
+        assert payoffs.dtype == np.float32
+        assert expected_payoffs.dtype == np.float64
+        assert payoffs == pytest.approx(ContractBook(self.contracts).payoff_all(self.spots), rel=1e-6, abs=1e-5)
+        assert expected_payoffs == pytest.approx(ContractBook(self.contracts).calc_expected_payoffs(self.spots),
+                                                 rel=1e-6, abs=1e-5)
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from src.model import *
+
+MarketData.initialize()
+
+
+@pytest.mark.parametrize('model', [BSVolModel, FlatVolModel])
+class TestVolCache:
+    und = Stock.TEST_COMPANY
+    strike = 0.95 * MarketData.get_spot()[und]
+    expiry = 2.0
+
+    def test_cached_vol(self, model):
+        mod = model(self.und)
+        vol = mod.get_vol(self.strike, self.expiry)
+        assert mod.get_vol(self.strike, self.expiry) == vol
+        if model == BSVolModel:
+            expected = mod.volgrid.get_vol(np.array([(mod.reference_spot, 1.0)]))[0]
+        else:
+            expected = mod.volgrid.get_vol(np.array([(self.strike, self.expiry)]))[0]
+        assert vol == pytest.approx(expected)
+
+    def test_bump_volgrid_clears_cache(self, model):
+        mod = model(self.und)
+        volgrid = MarketData.get_volgrid()[self.und]
+        mod.volgrid = VolGrid(self.und, volgrid.points.copy(), volgrid.values.copy())
+        vol = mod.get_vol(self.strike, self.expiry)
+        mod.bump_volgrid(0.01)
+        assert mod.get_vol(self.strike, self.expiry) == pytest.approx(vol + 0.01)
+
+    def test_bump_shared_volgrid(self, model):
+        volgrid = MarketData.get_volgrid()[self.und]
+        mod, other = model(self.und), model(self.und)
+        mod.volgrid = other.volgrid = VolGrid(self.und, volgrid.points.copy(), volgrid.values.copy())
+        vol = mod.get_vol(self.strike, self.expiry)
+        other.bump_volgrid(0.05)
+        assert mod.get_vol(self.strike, self.expiry) == pytest.approx(vol + 0.05)
+
+    def test_get_vol_batch(self, model):
+        mod = model(self.und)
+        strikes = self.strike * np.array([0.5, 0.8, 1.0, 1.2, 3.0])
+        expiries = np.array([0.1, 0.5, 1.0, 2.0, 5.0])
+        expected = [mod.get_vol(k, t) for k, t in zip(strikes, expiries)]
+        assert mod.get_vol_batch(strikes, expiries) == pytest.approx(expected)
+        expected = [mod.get_vol(k, self.expiry) for k in strikes]
+        assert mod.get_vol_batch(strikes, self.expiry) == pytest.approx(expected)
+
+
+class TestFlatVolTable:
+    und = Stock.TEST_COMPANY
+    vol_table_steps = 200
+
+    def test_vol_table_on_volgrid_nodes(self):
+        mod = FlatVolModel(self.und, self.vol_table_steps)
+        strikes, expiries = mod.volgrid.points.T
+        assert mod.get_vol_batch(strikes, expiries) == pytest.approx(mod.volgrid.values)
+
+    def test_vol_table_interpolation(self):
+        mod_exact = FlatVolModel(self.und)
+        mod_table = FlatVolModel(self.und, self.vol_table_steps)
+        strikes = np.linspace(0.3, 1.7, 57) * MarketData.get_spot()[self.und]
+        expiries = np.linspace(0.0, 2.5, 43)[:, None]
+        vols = mod_table.get_vol_batch(strikes, expiries)
+        assert vols == pytest.approx(mod_exact.get_vol_batch(strikes, expiries), abs=1e-3)
+        assert vols[7, 11] == pytest.approx(mod_table.get_vol(strikes[11], expiries[7, 0]))
+
+    def test_bump_volgrid_rebuilds_table(self):
+        mod = FlatVolModel(self.und, self.vol_table_steps)
+        volgrid = MarketData.get_volgrid()[self.und]
+        mod.volgrid = VolGrid(self.und, volgrid.points.copy(), volgrid.values.copy())
+        vol = mod.get_vol(101.0, 0.7)
+        mod.bump_volgrid(0.01)
+        assert mod.get_vol(101.0, 0.7) == pytest.approx(vol + 0.01)
+
+    def test_bump_shared_volgrid_rebuilds_table(self):
+        volgrid = MarketData.get_volgrid()[self.und]
+        mod, other = FlatVolModel(self.und, self.vol_table_steps), FlatVolModel(self.und, self.vol_table_steps)
+        mod.volgrid = other.volgrid = VolGrid(self.und, volgrid.points.copy(), volgrid.values.copy())
+        vol = mod.get_vol(101.0, 0.7)
+        vols = mod.get_vol_batch([101.0, 102.0], 0.7)
+        other.bump_volgrid(0.01)
+        assert mod.get_vol(101.0, 0.7) == pytest.approx(vol + 0.01)
+        assert mod.get_vol_batch([101.0, 102.0], 0.7) == pytest.approx(vols + 0.01)
@@ -175,3 +175,31 @@ class TestEuropeanPDEPricer:
         pricer = EuropeanPDEPricer(self.contract, self.model, param)
         pv = pricer.calc_fair_value()
         assert pv == pytest.approx(expected_pv)
+
+
+class TestGenericMCPricer:
+    und = Stock.TEST_COMPANY
+    spot = MarketData.get_spot()[und]
+    expiry = 1.0
+    num_mon = 4
+    model = FlatVolModel(und)
+    params = MCParams(num_of_path=2000)
+
+    @pytest.mark.parametrize('derivative_type', [PutCallFwd.CALL, PutCallFwd.PUT])
+    @pytest.mark.parametrize('up_down, barrier', [(UpDown.UP, 0.99), (UpDown.UP, 1.2), (UpDown.DOWN, 1.01),
+                                                  (UpDown.DOWN, 0.8)])
+    @pytest.mark.parametrize('in_out', [InOut.IN, InOut.OUT])
+    def test_barrier_matches_dict_payoff(self, derivative_type, up_down, barrier, in_out):
+        contract = EuropeanBarrierContract(self.und, derivative_type, LongShort.LONG, self.spot, self.expiry,
+                                           self.num_mon, barrier * self.spot, up_down, in_out)
+        pricer = GenericMCPricer(contract, self.model, self.params)
+        spot_paths = pricer.mc_method.simulate_spot_paths()
+        fixing_times = [0] + contract.get_timeline()
+        path_payoff = [contract.payoff(dict(zip(fixing_times, [self.spot] + list(path)))) for path in spot_paths]
+        expected_fv = np.mean(path_payoff) * self.model.calc_df(self.expiry)
+        assert pricer.calc_fair_value() == pytest.approx(expected_fv)
+
+    def test_barrier_breached_at_inception(self):
+        contract = EuropeanBarrierContract(self.und, PutCallFwd.CALL, LongShort.LONG, self.spot, self.expiry,
+                                           self.num_mon, 1.01 * self.spot, UpDown.DOWN, InOut.OUT)
+        assert GenericMCPricer(contract, self.model, self.params).calc_fair_value() == 0.0